@@ -144,6 +144,7 @@ args=("$@")
 new_args=()
 audio_set=0
 expect_output_value=0
+expect_option_value=0
 output_set=0
 
 for ((i=0; i<${#args[@]}; i++)); do
@@ -205,6 +206,20 @@ for ((i=0; i<${#args[@]}; i++)); do
         continue
     fi
 
+    # Pass the value of any other option through unchanged (e.g. --overlap 5),
+    # so it isn't taken for the audio file or output path
+    if [[ $expect_option_value -eq 1 ]]; then
+        new_args+=("$token")
+        expect_option_value=0
+        continue
+    fi
+
+    if [[ "$token" == "-m" || "$token" == "--model" || "$token" == "--chunk-duration" || "$token" == "--overlap" || "$token" == "--batch-size" || "$token" == "--dtype" || "$token" == "--parallel" ]]; then
+        new_args+=("$token")
+        expect_option_value=1
+        continue
+    fi
+
     # First positional arg is the audio file; expand it
     if [[ $audio_set -eq 0 && "$token" != -* ]]; then
         # Ignore empty first positional (can happen if Raycast passes an empty optional)
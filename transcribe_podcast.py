@@ -6,16 +6,30 @@ Optimized for long podcast files.
 """
 
 import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import math
+import multiprocessing
 import os
+import queue
+import socket
+import socketserver
 import sys
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import timedelta
 import warnings
 warnings.filterwarnings("ignore")
 
 try:
     from parakeet_mlx import from_pretrained
+    import mlx.core as mx
+    import mlx.nn as nn
 except ImportError:
     print("Error: parakeet-mlx is not installed.")
     print("Please install it with: pip install parakeet-mlx")
@@ -24,89 +38,782 @@ except ImportError:
 
 try:
     import soundfile as sf
-    import librosa
+    import soxr
     import numpy as np
 except ImportError as e:
     print(f"Error: Missing required package: {e}")
-    print("Please install with: pip install soundfile librosa numpy")
+    print("Please install with: pip install soundfile soxr numpy")
     sys.exit(1)
 
+try:
+    # Optional: split on silence instead of fixed windows
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+try:
+    # Lets chunks be fed to the model as arrays instead of temporary files
+    from parakeet_mlx.audio import get_logmel, load_audio
+except ImportError:
+    get_logmel = load_audio = None
+
+
+# Weight precisions selectable with --dtype: (load dtype, quantization bits)
+MODEL_DTYPES = {
+    "fp32": (mx.float32, None),
+    "bf16": (mx.bfloat16, None),
+    "int8": (mx.bfloat16, 8),
+    "int4": (mx.bfloat16, 4),
+}
+
+# Unix socket the --daemon server listens on
+SOCKET_PATH = Path.home() / ".parakeet.sock"
+
+# Decoded 16 kHz mono audio, reused when the same file is transcribed again
+CACHE_DIR = Path.home() / ".cache" / "podcast-transcribe"
+
+# Least recently used cache files are pruned beyond this size (~9 hours of audio)
+CACHE_MAX_BYTES = 2 * 1024**3
+
 
 def format_time(seconds):
-    """Convert seconds to human-readable format."""
-    return str(timedelta(seconds=int(seconds)))
+    """Convert seconds to human-readable H:MM:SS format."""
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def fixed_spans(total_duration, chunk_duration=300):
+    """Split the audio into back-to-back windows of chunk_duration seconds."""
+    starts = np.arange(0, total_duration, chunk_duration)
+    ends = np.minimum(starts + chunk_duration, total_duration)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def overlap_spans(spans, overlap=3.0):
+    """
+    Start every chunk after the first `overlap` seconds early.
+    
+    A word cut at a chunk boundary is then heard whole in at least one chunk;
+    the repeated words are removed again by dedupe_overlap.
+    """
+    return spans[:1] + [
+        (max(previous_start, start - overlap), end)
+        for (previous_start, _), (start, end) in zip(spans, spans[1:])
+    ]
+
+
+def dedupe_overlap(previous_words, text, max_words=20, min_words=2):
+    """
+    Drop words at the start of a chunk that repeat the end of the previous chunk.
+    
+    Finds the longest run of up to max_words words that ends the previous chunk
+    and reappears at the start of text, ignoring case and punctuation. Up to two
+    leading words may precede the run, since the overlap can start mid-word.
+    
+    Args:
+        previous_words: Words at the end of the previous chunk
+        text: Transcript of the current chunk
+        max_words: Longest overlap to look for
+        min_words: Shortest run trusted as a repeat; 1 is only safe when the
+            overlap is too short to hold more than one word
+    
+    Returns:
+        text without the repeated words
+    """
+    def normalize(words):
+        return [word.strip(".,!?;:\"'").lower() for word in words]
+    
+    words = text.split()
+    previous = normalize(previous_words[-max_words:])
+    current = normalize(words[:max_words + 2])
+    
+    for skip in range(3):
+        for k in range(min(len(previous), len(current) - skip), 0, -1):
+            # Runs after a skipped fragment need at least two words to be trusted
+            if k < (max(min_words, 2) if skip else min_words):
+                break
+            if current[skip:skip + k] == previous[-k:]:
+                return " ".join(words[skip + k:])
+    return text
+
+
+def downmix(data):
+    """Average a (frames, channels) block to mono float32."""
+    if data.shape[1] == 1:
+        return data[:, 0]
+    return np.mean(data, axis=1, out=np.empty(data.shape[0], dtype=np.float32))
+
+
+def decode_with_ffmpeg(audio_path, sr=16000):
+    """
+    Decode a whole file to mono sr with ffmpeg.
+    
+    Fallback for formats libsndfile can't open (e.g. M4A/AAC); unlike the
+    soundfile path this holds the full file in memory.
+    """
+    if load_audio is None:
+        raise RuntimeError("parakeet-mlx's ffmpeg loader is unavailable")
+    return np.array(load_audio(Path(audio_path), sr), dtype=np.float32)
+
+
+def prune_cache(keep, max_bytes=CACHE_MAX_BYTES):
+    """Delete the least recently used cache files until CACHE_DIR fits in max_bytes."""
+    entries = []
+    for path in CACHE_DIR.glob("*.f32"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def load_cached_audio(audio_path, sr=16000):
+    """
+    Return the file's audio resampled to mono sr, decoding it only once.
+    
+    The decoded samples are stored as raw float32 in CACHE_DIR, keyed by the
+    file's path and modification time, and memory-mapped on later runs. The
+    cache is kept under CACHE_MAX_BYTES by pruning least recently used files.
+    
+    Args:
+        audio_path: Path to the audio file
+        sr: Sample rate of the cached audio
+    
+    Returns:
+        Read-only float32 array of the whole file at sr
+    """
+    audio_path = Path(audio_path)
+    key = hashlib.blake2b(
+        f"{audio_path.resolve()}|{audio_path.stat().st_mtime_ns}|{sr}|mono".encode()
+    ).hexdigest()[:16]
+    cache_path = CACHE_DIR / f"{key}.f32"
+    
+    if cache_path.exists():
+        print("Using cached decoded audio")
+        # Mark as recently used so pruning removes other files first
+        os.utime(cache_path)
+    else:
+        print("Decoding audio (cached for future runs)...")
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'wb') as out:
+                try:
+                    f = sf.SoundFile(str(audio_path))
+                except RuntimeError:
+                    decode_with_ffmpeg(audio_path, sr).tofile(out)
+                else:
+                    with f:
+                        resampler = None
+                        if f.samplerate != sr:
+                            resampler = soxr.ResampleStream(f.samplerate, sr, 1, dtype='float32', quality='HQ')
+                        
+                        for block in f.blocks(blocksize=60 * f.samplerate, dtype='float32', always_2d=True):
+                            chunk = downmix(block)
+                            if resampler is not None:
+                                chunk = resampler.resample_chunk(chunk)
+                            chunk.tofile(out)
+                        if resampler is not None:
+                            resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True).tofile(out)
+            
+            # Only complete files ever appear under the cache key
+            os.replace(temp_path, cache_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        
+        prune_cache(keep=cache_path)
+    
+    if cache_path.stat().st_size == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(cache_path, dtype=np.float32, mode='r')
+
+
+def iter_audio_chunks(audio_path, spans, target_sr=16000, audio=None):
+    """
+    Stream audio from disk one chunk at a time instead of decoding the whole file.
+    
+    Args:
+        audio_path: Path to the audio file
+        spans: List of (start_time, end_time) tuples in seconds to read
+        target_sr: Sample rate of the yielded audio
+        audio: Already decoded audio at target_sr (e.g. from load_cached_audio)
+            to slice instead of reading audio_path
+    
+    Yields:
+        (start_time, end_time, chunk_audio) tuples, with chunk_audio as mono float32
+    """
+    if audio is not None:
+        for start_time, end_time in spans:
+            chunk = np.asarray(audio[int(start_time * target_sr):int(end_time * target_sr)])
+            if len(chunk):
+                yield start_time, end_time, chunk
+        return
+    
+    with sf.SoundFile(str(audio_path)) as f:
+        sr_native = f.samplerate
+        
+        for start_time, end_time in spans:
+            start_frame = int(start_time * sr_native)
+            f.seek(start_frame)
+            data = f.read(frames=int(end_time * sr_native) - start_frame, dtype='float32', always_2d=True)
+            if len(data) == 0:
+                continue
+            
+            # Downmix and resample only the current block
+            chunk = downmix(data)
+            if sr_native != target_sr:
+                chunk = soxr.resample(chunk, sr_native, target_sr, quality='HQ')
+            
+            yield start_time, end_time, chunk
+
+
+def detect_speech(audio_path, total_duration, sr=16000, frame_duration=0.03, aggressiveness=2, audio=None):
+    """
+    Run voice activity detection over the whole file.
+    
+    Audio is streamed in 60 second blocks so only the per-frame flags are kept.
+    
+    Returns:
+        Boolean array with one speech/non-speech flag per frame_duration frame
+    """
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_samples = int(frame_duration * sr)
+    flags = []
+    leftover = np.zeros(0, dtype=np.int16)
+    
+    for _, _, block in iter_audio_chunks(audio_path, fixed_spans(total_duration, 60), sr, audio):
+        pcm = np.concatenate([leftover, (np.clip(block, -1, 1) * 32767).astype(np.int16)])
+        num_frames = len(pcm) // frame_samples
+        for frame in pcm[:num_frames * frame_samples].reshape(num_frames, frame_samples):
+            flags.append(vad.is_speech(frame.tobytes(), sr))
+        leftover = pcm[num_frames * frame_samples:]
+    
+    return np.array(flags, dtype=bool)
+
+
+def speech_spans(flags, chunk_duration=300, frame_duration=0.03, min_silence=0.2):
+    """
+    Greedily pack speech ranges into chunks of up to chunk_duration seconds.
+    
+    Chunks are only cut inside silences of at least min_silence seconds, and
+    non-speech before, after and between chunks is skipped entirely.
+    
+    Args:
+        flags: Per-frame speech flags from detect_speech
+        chunk_duration: Maximum chunk length in seconds
+        frame_duration: Duration of each flag in seconds
+        min_silence: Shortest silence in seconds that may separate two chunks
+    
+    Returns:
+        List of (start_time, end_time) tuples in seconds
+    """
+    speech = np.flatnonzero(flags)
+    if len(speech) == 0:
+        return []
+    
+    # Speech ranges separated by silences of at least min_silence
+    gap_frames = math.ceil(min_silence / frame_duration)
+    breaks = np.flatnonzero(np.diff(speech) > gap_frames)
+    starts = speech[np.r_[0, breaks + 1]]
+    ends = speech[np.r_[breaks, len(speech) - 1]] + 1
+    
+    max_frames = int(chunk_duration / frame_duration)
+    frame_spans = []
+    current = None
+    for start, end in zip(starts, ends):
+        if current is not None and end - current[0] <= max_frames:
+            current[1] = end
+            continue
+        if current is not None:
+            frame_spans.append(tuple(current))
+        # A single range longer than a chunk has to be hard-split
+        while end - start > max_frames:
+            frame_spans.append((start, start + max_frames))
+            start += max_frames
+        current = [start, end]
+    frame_spans.append(tuple(current))
+    
+    # Pad each chunk by half the minimum silence so word edges aren't clipped,
+    # except where hard-split chunks meet, so chunks never overlap
+    pad = min_silence / 2
+    total_duration = len(flags) * frame_duration
+    spans = []
+    for i, (start, end) in enumerate(frame_spans):
+        start_pad = 0 if i > 0 and frame_spans[i - 1][1] == start else pad
+        end_pad = 0 if i + 1 < len(frame_spans) and frame_spans[i + 1][0] == end else pad
+        spans.append((max(0.0, start * frame_duration - start_pad), min(total_duration, end * frame_duration + end_pad)))
+    return spans
+
+
+def prefetch(iterable, depth=1):
+    """
+    Iterate over iterable while a background thread prepares the next items.
+    
+    Lets chunk decoding and resampling on the CPU overlap with inference on
+    the GPU. At most `depth` items are staged ahead to cap peak memory.
+    """
+    done = object()
+    iterator = iter(iterable)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = deque(executor.submit(next, iterator, done) for _ in range(depth))
+        while True:
+            item = pending.popleft().result()
+            if item is done:
+                break
+            pending.append(executor.submit(next, iterator, done))
+            yield item
+
+
+def iter_batches(iterable, batch_size):
+    """Group items from iterable into lists of up to batch_size items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def default_batch_size(chunk_duration):
+    """
+    Pick how many chunks to transcribe per model call from available unified memory.
+    
+    Falls back to one chunk at a time when the Metal device can't be queried.
+    """
+    try:
+        device_info = mx.device_info if hasattr(mx, 'device_info') else mx.metal.device_info
+        memory = device_info()["max_recommended_working_set_size"]
+    except Exception:
+        return 1
+    
+    # Roughly 2 GB of working memory per 5 minutes of audio; keep half in reserve
+    per_chunk = 2 * 1024**3 * chunk_duration / 300
+    return max(1, min(8, int(memory / 2 // per_chunk)))
+
+
+def is_silent(chunk_audio, threshold=1e-3):
+    """Check whether a chunk's RMS level is below threshold (about -60 dBFS by default)."""
+    if len(chunk_audio) == 0:
+        return True
+    return np.sqrt(np.dot(chunk_audio, chunk_audio) / len(chunk_audio)) < threshold
+
+
+def supports_array_input(model):
+    """Check whether chunks can be fed to the model as arrays."""
+    return get_logmel is not None and hasattr(model, 'generate') and hasattr(model, 'preprocessor_config')
+
+
+def compute_mel(model, chunk_audio):
+    """Compute the model's log-mel features for a chunk as a (frames, mels) array."""
+    # float32 input, as parakeet-mlx's own load_audio produces
+    mel = get_logmel(mx.array(chunk_audio, dtype=mx.float32), model.preprocessor_config)
+    return mel[0] if mel.ndim == 3 else mel
+
+
+def transcribe_chunk(model, chunk_audio, sr=16000):
+    """
+    Transcribe a chunk of audio that is already in memory.
+    
+    The array is passed straight to the model when parakeet-mlx exposes array
+    input; otherwise the chunk is written to a temporary WAV file.
+    
+    Args:
+        model: The loaded parakeet model
+        chunk_audio: Mono float32 samples
+        sr: Sample rate of chunk_audio
+    
+    Returns:
+        The model's transcription result
+    """
+    if supports_array_input(model):
+        return model.generate(mx.expand_dims(compute_mel(model, chunk_audio), 0))[0]
+    
+    # Fallback for models without array input: model.transcribe only takes a
+    # path, so use a RAM-backed directory where there is one to avoid disk writes
+    temp_dir = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+    fd, temp_file = tempfile.mkstemp(suffix='.wav', dir=temp_dir)
+    os.close(fd)
+    try:
+        sf.write(temp_file, chunk_audio, sr, subtype='FLOAT')
+        return model.transcribe(temp_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def transcribe_batch(model, chunks, sr=16000):
+    """
+    Transcribe several chunks of audio with as few model calls as possible.
+    
+    parakeet-mlx doesn't mask padding inside the encoder, so padded chunks
+    would be transcribed differently than on their own. Only chunks with the
+    same number of feature frames are stacked into one call; the rest run one
+    at a time. Silent chunks are not sent to the model at all.
+    
+    Args:
+        model: The loaded parakeet model
+        chunks: List of mono float32 sample arrays
+        sr: Sample rate of the chunks
+    
+    Returns:
+        List with the transcript text of each chunk (None if no text was returned)
+    """
+    silent = [is_silent(chunk) for chunk in chunks]
+    if any(silent):
+        texts = [""] * len(chunks)
+        speech = [i for i, chunk_is_silent in enumerate(silent) if not chunk_is_silent]
+        if speech:
+            for i, text in zip(speech, transcribe_batch(model, [chunks[i] for i in speech], sr)):
+                texts[i] = text
+        return texts
+    
+    if len(chunks) == 1 or not supports_array_input(model):
+        results = [transcribe_chunk(model, chunk, sr) for chunk in chunks]
+        return [result.text.strip() if hasattr(result, 'text') else None for result in results]
+    
+    mels = [compute_mel(model, chunk) for chunk in chunks]
+    groups = {}
+    for i, mel in enumerate(mels):
+        groups.setdefault(mel.shape[0], []).append(i)
+    
+    texts = [None] * len(chunks)
+    for indices in groups.values():
+        results = model.generate(mx.stack([mels[i] for i in indices]))
+        for i, result in zip(indices, results):
+            texts[i] = result.text.strip()
+    return texts
+
+
+def transcribe_batch_or_each(model, chunks, sr=16000):
+    """
+    Transcribe a batch, retrying its chunks one at a time if the batch fails.
+    
+    A single bad chunk (or running out of memory on the whole batch) then
+    only loses that chunk's transcript instead of the entire batch.
+    
+    Returns:
+        List of (chunk_text, error) tuples, one per chunk
+    """
+    try:
+        return [(chunk_text, None) for chunk_text in transcribe_batch(model, chunks, sr)]
+    except Exception as e:
+        if len(chunks) == 1:
+            return [(None, e)]
+    
+    outcomes = []
+    for chunk in chunks:
+        try:
+            # A single chunk goes straight to transcribe_chunk
+            outcomes.append((transcribe_batch(model, [chunk], sr)[0], None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def transcribe_sequential(model, chunks, batch_size=1, sr=16000):
+    """
+    Transcribe chunks in order on the current device, batch_size at a time.
+    
+    Yields:
+        (start_time, end_time, chunk_text, error) tuples in chunk order
+    """
+    # The next batch is decoded in the background while the current one transcribes
+    for batch in iter_batches(prefetch(chunks, depth=batch_size), batch_size):
+        outcomes = transcribe_batch_or_each(model, [chunk_audio for _, _, chunk_audio in batch], sr)
+        for (chunk_start_time, chunk_end_time, _), (chunk_text, error) in zip(batch, outcomes):
+            yield chunk_start_time, chunk_end_time, chunk_text, error
+
+
+def gpu_count():
+    """Number of visible CUDA devices (1 when torch isn't installed)."""
+    try:
+        import torch
+    except ImportError:
+        return 1
+    return torch.cuda.device_count()
+
+
+# (model_name, dtype, device) each parallel worker process loads its model with
+_worker_config = None
+# The worker's model, or the error loading it raised, once its first batch arrives
+_worker_model = None
+_worker_error = None
+
+
+def _init_worker(model_name, dtype, devices):
+    """Claim a GPU for this worker process; the model is loaded on first use."""
+    global _worker_config
+    try:
+        device = devices.get(timeout=10)
+    except queue.Empty:
+        # Replacement for a worker that exited; its device was never returned
+        device = None
+    _worker_config = (model_name, dtype, device)
+
+
+def _load_worker_model():
+    """Load the worker's model on its GPU, raising the same error on every call if that fails."""
+    global _worker_model, _worker_error
+    if _worker_model is None and _worker_error is None:
+        model_name, dtype, device = _worker_config
+        try:
+            if device is not None:
+                # mlx.core was already imported when this process re-imported
+                # the script, so the device is picked through MLX itself
+                mx.set_default_device(mx.Device(mx.gpu, device))
+            _worker_model = load_model(model_name, dtype)
+        except Exception as e:
+            _worker_error = e
+    if _worker_error is not None:
+        raise _worker_error
+    return _worker_model
+
+
+def _transcribe_in_worker(item):
+    """Transcribe one batch of indexed chunks inside a worker process."""
+    indices, chunks, sr = item
+    try:
+        model = _load_worker_model()
+    except Exception as e:
+        # Reported per chunk like any other error instead of killing the worker
+        return [(index, None, f"Error loading model: {e}") for index in indices]
+    
+    outcomes = transcribe_batch_or_each(model, chunks, sr)
+    # Exceptions may not pickle, so only their messages are sent back
+    return [
+        (index, chunk_text, None if error is None else str(error))
+        for index, (chunk_text, error) in zip(indices, outcomes)
+    ]
 
 
-def transcribe_in_chunks(model, audio_path, chunk_duration=300, total_duration=None):
+def transcribe_parallel(chunks, workers, model_name, dtype="bf16", sr=16000, batch_size=1):
+    """
+    Transcribe chunks across several GPUs, one worker process per device.
+    
+    Each worker transcribes batch_size chunks per model call. Results arrive
+    in any order and are re-ordered by chunk index. At most two batches per
+    worker are decoded ahead to cap peak memory. A worker that can't load the
+    model reports the error for each of its chunks instead of stopping the run.
+    
+    Yields:
+        (start_time, end_time, chunk_text, error) tuples in chunk order
+    """
+    ctx = multiprocessing.get_context("spawn")
+    devices = ctx.Queue()
+    for device in range(workers):
+        devices.put(device)
+    
+    spans = {}
+    in_flight = threading.BoundedSemaphore(2 * workers)
+    stopped = threading.Event()
+    
+    def tasks():
+        for batch in iter_batches(enumerate(chunks), batch_size):
+            # Stop feeding the pool once results are no longer read, so the
+            # pool's task thread can be joined when it shuts down
+            while not in_flight.acquire(timeout=0.1):
+                if stopped.is_set():
+                    return
+            for index, (chunk_start_time, chunk_end_time, _) in batch:
+                spans[index] = (chunk_start_time, chunk_end_time)
+            yield [index for index, _ in batch], [chunk_audio for _, (_, _, chunk_audio) in batch], sr
+    
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(model_name, dtype, devices)) as pool:
+        finished = {}
+        next_index = 0
+        try:
+            for results in pool.imap_unordered(_transcribe_in_worker, tasks()):
+                in_flight.release()
+                for index, chunk_text, error in results:
+                    finished[index] = (chunk_text, error)
+                while next_index in finished:
+                    chunk_text, error = finished.pop(next_index)
+                    yield (*spans.pop(next_index), chunk_text, error)
+                    next_index += 1
+        finally:
+            stopped.set()
+
+
+def transcribe_in_chunks(model, audio_path, out_fh, chunk_duration=300, total_duration=None, batch_size=1, use_vad=True, parallel=1, model_name=None, dtype="bf16", overlap=3.0, use_cache=True):
     """
     Transcribe audio in chunks to handle long files.
     
+    Each chunk's text is written to out_fh as soon as it is transcribed, so
+    the full transcript is never held in memory and partial output survives
+    an interrupted run.
+    
     Args:
         model: The loaded parakeet model
         audio_path: Path to the audio file
+        out_fh: Open text file the transcript is written to
         chunk_duration: Duration of each chunk in seconds
         total_duration: Total duration of the audio file
+        batch_size: Number of chunks transcribed per model call
+        use_vad: Split on silence (requires webrtcvad) instead of fixed windows
+        parallel: Number of GPU worker processes (1 transcribes with `model` in-process;
+            otherwise `model` is unused and may be None)
+        model_name: Model identifier the parallel workers load
+        dtype: Weight precision the parallel workers load
+        overlap: Seconds each chunk overlaps the previous one; repeated words are removed
+        use_cache: Reuse (or create) a cached decoded copy of the audio in CACHE_DIR
     
     Returns:
-        Combined transcript text
+        Number of words written
     """
     print(f"\nLoading audio for chunked processing...")
     
+    word_count = 0
+    
     try:
-        # Load audio with librosa (handles various formats)
-        audio, sr = librosa.load(str(audio_path), sr=16000, mono=True)
+        sr = 16000
+        
+        # Only the header is read here; samples are streamed chunk by chunk below
+        try:
+            sf_info = sf.info(str(audio_path))
+            total_duration = sf_info.frames / sf_info.samplerate
+        except RuntimeError:
+            # Not a format libsndfile can open (e.g. M4A/AAC)
+            sf_info = None
+        
+        audio = None
+        if use_cache:
+            try:
+                audio = load_cached_audio(audio_path, sr)
+            except Exception as e:
+                print(f"Warning: Could not cache decoded audio: {e}")
         
-        # Calculate chunk size
-        chunk_samples = int(chunk_duration * sr)
-        total_samples = len(audio)
-        num_chunks = (total_samples + chunk_samples - 1) // chunk_samples
+        if sf_info is None:
+            if audio is None:
+                print("Decoding audio with ffmpeg...")
+                audio = decode_with_ffmpeg(audio_path, sr)
+            total_duration = len(audio) / sr
+        
+        if use_vad and webrtcvad is not None:
+            print("Detecting speech...")
+            spans = speech_spans(detect_speech(audio_path, total_duration, sr, audio=audio), chunk_duration)
+            speech_duration = sum(end - start for start, end in spans)
+            print(f"Found {format_time(speech_duration)} of speech; skipping {format_time(max(0, total_duration - speech_duration))} of silence")
+        else:
+            spans = fixed_spans(total_duration, chunk_duration)
+        if overlap > 0:
+            spans = overlap_spans(spans, overlap)
+        num_chunks = len(spans)
         
         print(f"Splitting into {num_chunks} chunks of up to {chunk_duration/60:.1f} minutes each")
         print("Processing chunks:")
         
-        transcripts = []
+        if batch_size > 1:
+            print(f"Transcribing {batch_size} chunks per batch")
         
-        for i in range(num_chunks):
-            start_sample = i * chunk_samples
-            end_sample = min((i + 1) * chunk_samples, total_samples)
-            chunk_audio = audio[start_sample:end_sample]
-            
-            # Create temporary file for chunk
-            temp_file = f"/tmp/chunk_{i}.wav"
-            sf.write(temp_file, chunk_audio, sr)
-            
+        chunks = iter_audio_chunks(audio_path, spans, sr, audio)
+        if parallel > 1:
+            print(f"Transcribing on {parallel} GPUs in parallel")
+            results = transcribe_parallel(chunks, parallel, model_name, dtype, sr, batch_size)
+        else:
+            results = transcribe_sequential(model, chunks, batch_size, sr)
+        
+        # Tail of the transcript so far, for removing words repeated in the
+        # overlap; fast speech runs at about 4 words per second
+        tail_words = max(20, math.ceil(4 * overlap))
+        previous_words = []
+        previous_end_time = None
+        
+        for chunk_index, (chunk_start_time, chunk_end_time, chunk_text, error) in enumerate(results, 1):
             # Progress indicator
-            chunk_start_time = start_sample / sr
-            chunk_end_time = end_sample / sr
-            print(f"  Chunk {i+1}/{num_chunks}: {format_time(chunk_start_time)} - {format_time(chunk_end_time)}...", end=' ', flush=True)
+            print(f"  Chunk {chunk_index}/{num_chunks}: {format_time(chunk_start_time)} - {format_time(chunk_end_time)}...", end=' ', flush=True)
             
-            try:
-                # Transcribe chunk
-                result = model.transcribe(temp_file)
-                if hasattr(result, 'text'):
-                    chunk_text = result.text.strip()
-                    transcripts.append(chunk_text)
-                    print(f"✓ ({len(chunk_text.split())} words)")
-                else:
-                    print("⚠ No text returned")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-            finally:
-                # Clean up temp file
-                import os
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+            if error is not None:
+                print(f"✗ Error: {error}")
+                previous_words = []
+            elif chunk_text is None:
+                print("⚠ No text returned")
+                previous_words = []
+            else:
+                # How far this chunk really reaches back into the previous one;
+                # VAD spans separated by long silences don't overlap at all
+                actual_overlap = previous_end_time - chunk_start_time if previous_end_time is not None else 0
+                if actual_overlap > 0 and previous_words:
+                    # Only a one-word repeat fits in an overlap shorter than about a word
+                    chunk_text = dedupe_overlap(
+                        previous_words,
+                        chunk_text,
+                        max_words=max(20, math.ceil(4 * actual_overlap)),
+                        min_words=1 if actual_overlap < 0.5 else 2,
+                    )
+                chunk_words = len(chunk_text.split())
+                previous_words = (previous_words + chunk_text.split())[-tail_words:] if chunk_words else []
+                if chunk_words:
+                    out_fh.write(chunk_text if word_count == 0 else " " + chunk_text)
+                    out_fh.flush()
+                    word_count += chunk_words
+                print(f"✓ ({chunk_words} words)")
+            
+            previous_end_time = chunk_end_time
         
-        # Combine all transcripts
-        transcript = " ".join(transcripts)
-        return transcript
+        return word_count
         
     except Exception as e:
         print(f"\nError processing audio in chunks: {e}")
-        return "[Transcription failed]"
+        out_fh.write("[Transcription failed]" if word_count == 0 else " [Transcription failed]")
+        return word_count
+
+
+@functools.lru_cache(maxsize=1)
+def load_model(model_name, dtype="bf16"):
+    """
+    Load a parakeet model at the requested weight precision.
+    
+    The model is warmed up before it is returned, and the most recently loaded
+    model is cached, so repeated jobs in one process (e.g. the daemon) skip
+    re-initializing the weights.
+    
+    Args:
+        model_name: Model identifier or local path
+        dtype: One of MODEL_DTYPES; int8/int4 quantize the linear layers after loading
+    
+    Returns:
+        The loaded parakeet model
+    """
+    load_dtype, bits = MODEL_DTYPES[dtype]
+    model = from_pretrained(model_name, dtype=load_dtype)
+    
+    if bits is not None:
+        # Only layers whose input size splits evenly into quantization groups
+        nn.quantize(
+            model,
+            group_size=64,
+            bits=bits,
+            class_predicate=lambda path, module: hasattr(module, 'to_quantized') and module.weight.shape[-1] % 64 == 0,
+        )
+    
+    # Run a second of silence through the model so the first real chunk
+    # doesn't pay for kernel compilation and weight paging
+    try:
+        transcribe_chunk(model, np.zeros(16000, dtype=np.float32))
+    except Exception:
+        pass
+    
+    return model
 
 
-def transcribe_audio(audio_path, output_path=None, model_name="mlx-community/parakeet-tdt-0.6b-v2", chunk_duration=300):
+def transcribe_audio(audio_path, output_path=None, model_name="mlx-community/parakeet-tdt-0.6b-v2", chunk_duration=300, batch_size=None, use_vad=True, dtype="bf16", parallel=1, overlap=3.0, use_cache=True):
     """
     Transcribe an audio file using parakeet-mlx.
     
@@ -115,6 +822,12 @@ def transcribe_audio(audio_path, output_path=None, model_name="mlx-community/par
         output_path: Path for the output markdown file (optional)
         model_name: Model identifier to use (default: mlx-community/parakeet-tdt-0.6b-v2)
         chunk_duration: Duration of each chunk in seconds (default: 300 = 5 minutes)
+        batch_size: Chunks transcribed per model call (default: auto, based on available memory)
+        use_vad: Split long files on silence instead of fixed windows (default: True)
+        dtype: Model weight precision, one of fp32, bf16, int8, int4 (default: bf16)
+        parallel: Number of GPUs to spread chunks across (default: 1)
+        overlap: Seconds of overlap between consecutive chunks (default: 3.0)
+        use_cache: Cache decoded audio for long files to skip decoding on re-runs (default: True)
     """
     audio_path = Path(audio_path)
     
@@ -143,79 +856,276 @@ def transcribe_audio(audio_path, output_path=None, model_name="mlx-community/par
         total_duration = None
         sample_rate = 16000  # Default sample rate
     
+    # Short files are transcribed whole in-process, so workers only help long ones
+    chunked = bool(total_duration and total_duration > chunk_duration)
+    if parallel > 1 and chunked:
+        devices = gpu_count()
+        if devices < 2:
+            print(f"Warning: --parallel needs more than one GPU ({devices} found); transcribing sequentially")
+            parallel = 1
+        else:
+            parallel = min(parallel, devices)
+    else:
+        parallel = 1
+    
     # Initialize Parakeet
-    print(f"\nLoading model: {model_name}")
+    print(f"\nLoading model: {model_name} ({dtype})")
     print("This may take a moment on first run as the model downloads.")
     
     start_time = time.time()
     
-    try:
-        # Load the model
-        model = from_pretrained(model_name)
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        print("Make sure ffmpeg is installed on your system.")
-        sys.exit(1)
-    
-    print("Model loaded successfully!")
-    
-    # For long audio files, we'll process in chunks
-    if total_duration and total_duration > chunk_duration:
-        print(f"\nAudio is longer than {chunk_duration/60:.0f} minutes. Processing in chunks...")
-        transcript = transcribe_in_chunks(model, audio_path, chunk_duration, total_duration)
+    if parallel > 1:
+        # Each worker loads its own copy on its GPU; none is needed in this process
+        model = None
+        print(f"Model will be loaded by {parallel} GPU worker processes")
     else:
-        print("\nProcessing entire audio file...")
         try:
-            result = model.transcribe(str(audio_path))
-            transcript = result.text.strip() if hasattr(result, 'text') else str(result)
+            # Load the model
+            model = load_model(model_name, dtype)
         except Exception as e:
-            print(f"Error during transcription: {e}")
-            print("File may be too large. Trying chunked processing...")
-            # Fallback to chunked processing
-            transcript = transcribe_in_chunks(model, audio_path, chunk_duration, total_duration or chunk_duration * 20)
+            print(f"Error loading model: {e}")
+            print("Make sure ffmpeg is installed on your system.")
+            sys.exit(1)
+        
+        print("Model loaded successfully!")
     
-    # Calculate processing time
-    processing_time = time.time() - start_time
-    print(f"\nTranscription completed in {format_time(processing_time)}")
+    if batch_size is None:
+        batch_size = default_batch_size(chunk_duration)
     
-    if total_duration:
-        speed_ratio = total_duration / processing_time
-        print(f"Processing speed: {speed_ratio:.2f}x real-time")
+    # The transcript is streamed to disk as it is produced
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        out_fh = output_path.open('w', encoding='utf-8')
+    except Exception as e:
+        print(f"Error saving transcript: {e}")
+        sys.exit(1)
     
-    # Create markdown output
-    markdown_content = f"""# Transcript: {audio_path.name}
+    with out_fh:
+        out_fh.write(f"""# Transcript: {audio_path.name}
 
 ## Metadata
 - **File**: {audio_path.name}
 - **Duration**: {format_time(total_duration) if total_duration else 'Unknown'}
 - **Transcription Date**: {time.strftime('%Y-%m-%d %H:%M:%S')}
 - **Model**: {model_name}
-- **Processing Time**: {format_time(processing_time)}
+- **Precision**: {dtype}
 
 ---
 
 ## Full Transcript
 
-{transcript}
+""")
+        
+        # For long audio files, we'll process in chunks
+        if chunked:
+            print(f"\nAudio is longer than {chunk_duration/60:.0f} minutes. Processing in chunks...")
+            word_count = transcribe_in_chunks(
+                model, audio_path, out_fh, chunk_duration, total_duration,
+                batch_size=batch_size,
+                use_vad=use_vad,
+                parallel=parallel,
+                model_name=model_name,
+                dtype=dtype,
+                overlap=overlap,
+                use_cache=use_cache,
+            )
+        else:
+            print("\nProcessing entire audio file...")
+            try:
+                # transcribe() prepares the audio in bf16 unless told the model's precision
+                result = model.transcribe(str(audio_path), dtype=MODEL_DTYPES[dtype][0])
+                transcript = result.text.strip() if hasattr(result, 'text') else str(result)
+                out_fh.write(transcript)
+                word_count = len(transcript.split())
+            except Exception as e:
+                print(f"Error during transcription: {e}")
+                print("File may be too large. Trying chunked processing...")
+                # Fallback to chunked processing
+                word_count = transcribe_in_chunks(
+                    model, audio_path, out_fh, chunk_duration, total_duration or chunk_duration * 20,
+                    batch_size=batch_size,
+                    use_vad=use_vad,
+                    parallel=parallel,
+                    model_name=model_name,
+                    dtype=dtype,
+                    overlap=overlap,
+                    use_cache=use_cache,
+                )
+        
+        # Calculate processing time
+        processing_time = time.time() - start_time
+        print(f"\nTranscription completed in {format_time(processing_time)}")
+        
+        if total_duration:
+            speed_ratio = total_duration / processing_time
+            print(f"Processing speed: {speed_ratio:.2f}x real-time")
+        
+        out_fh.write(f"""
 
 ---
 
+- **Processing Time**: {format_time(processing_time)}
+
 *Transcribed using parakeet-mlx*
-"""
+""")
     
-    # Save the output
-    try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(markdown_content, encoding='utf-8')
-        print(f"\nTranscript saved to: {output_path}")
+    print(f"\nTranscript saved to: {output_path}")
+    
+    # Print summary
+    print(f"Transcript contains approximately {word_count:,} words")
+
+
+class _SocketOutput:
+    """File-like object that relays printed output to a daemon client."""
+    
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.connected = True
+    
+    def write(self, text):
+        if text and self.connected:
+            try:
+                self.wfile.write((json.dumps({"output": text}) + "\n").encode('utf-8'))
+            except OSError:
+                # Client went away; keep transcribing so the output file is still written
+                self.connected = False
+        return len(text)
+    
+    def flush(self):
+        if self.connected:
+            try:
+                self.wfile.flush()
+            except OSError:
+                self.connected = False
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Accepts one JSON job per connection and waits for the worker to finish it."""
+    
+    def handle(self):
+        output = _SocketOutput(self.wfile)
+        done = threading.Event()
+        status = {"ok": False}
         
-        # Print summary
-        word_count = len(transcript.split())
-        print(f"Transcript contains approximately {word_count:,} words")
+        try:
+            job = json.loads(self.rfile.readline())
+        except ValueError as e:
+            output.write(f"Error: Invalid request: {e}\n")
+        else:
+            self.server.jobs.put((job, output, done, status))
+            done.wait()
         
+        try:
+            self.wfile.write((json.dumps({"done": True, "ok": status["ok"]}) + "\n").encode('utf-8'))
+        except OSError:
+            pass
+
+
+def _daemon_worker(jobs, model_name, dtype):
+    """Run queued jobs one at a time, defaulting to the daemon's resident model."""
+    while True:
+        job, output, done, status = jobs.get()
+        try:
+            with contextlib.redirect_stdout(output):
+                transcribe_audio(
+                    job["audio_path"],
+                    job.get("output_path"),
+                    job.get("model", model_name),
+                    job.get("chunk_duration", 300),
+                    batch_size=job.get("batch_size"),
+                    use_vad=job.get("use_vad", True),
+                    dtype=job.get("dtype", dtype),
+                    parallel=job.get("parallel", 1),
+                    overlap=job.get("overlap", 3.0),
+                    use_cache=job.get("use_cache", True),
+                )
+            status["ok"] = True
+        except SystemExit:
+            pass
+        except Exception as e:
+            output.write(f"Error: {e}\n")
+        finally:
+            done.set()
+
+
+def run_daemon(model_name="mlx-community/parakeet-tdt-0.6b-v2", dtype="bf16"):
+    """
+    Keep the model loaded and serve transcription jobs over a Unix socket.
+    
+    Clients send one newline-delimited JSON request per connection, e.g.
+    {"audio_path": ..., "output_path": ..., "chunk_duration": ...}, and receive
+    the job's printed output followed by a final {"done": true, "ok": ...} line.
+    """
+    if SOCKET_PATH.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(SOCKET_PATH))
+        except OSError:
+            # Left over from a daemon that didn't shut down cleanly
+            SOCKET_PATH.unlink()
+        else:
+            print(f"Error: A daemon is already listening on {SOCKET_PATH}")
+            sys.exit(1)
+        finally:
+            probe.close()
+    
+    print(f"Loading model: {model_name} ({dtype})")
+    try:
+        load_model(model_name, dtype)
     except Exception as e:
-        print(f"Error saving transcript: {e}")
+        print(f"Error loading model: {e}")
         sys.exit(1)
+    print("Model loaded successfully!")
+    
+    server = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), _DaemonHandler)
+    os.chmod(SOCKET_PATH, 0o600)
+    server.jobs = queue.Queue()
+    threading.Thread(target=_daemon_worker, args=(server.jobs, model_name, dtype), daemon=True).start()
+    
+    print(f"Daemon listening on {SOCKET_PATH} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping daemon...")
+    finally:
+        server.server_close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+
+def transcribe_via_daemon(job):
+    """
+    Hand a job to a running daemon and relay its output.
+    
+    Returns:
+        False if no daemon is listening, so the caller can transcribe in-process
+    """
+    if not SOCKET_PATH.exists():
+        return False
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(SOCKET_PATH))
+    except OSError:
+        sock.close()
+        return False
+    
+    with sock, sock.makefile('rwb') as stream:
+        stream.write((json.dumps(job) + "\n").encode('utf-8'))
+        stream.flush()
+        
+        for line in stream:
+            message = json.loads(line)
+            if "output" in message:
+                sys.stdout.write(message["output"])
+                sys.stdout.flush()
+            elif message.get("done"):
+                if not message["ok"]:
+                    sys.exit(1)
+                return True
+    
+    print("Error: Lost connection to the transcription daemon.")
+    sys.exit(1)
 
 
 def main():
@@ -224,6 +1134,7 @@ def main():
     )
     parser.add_argument(
         "audio_file",
+        nargs="?",
         help="Path to the audio file to transcribe"
     )
     parser.add_argument(
@@ -233,8 +1144,8 @@ def main():
     )
     parser.add_argument(
         "-m", "--model",
-        default="mlx-community/parakeet-tdt-0.6b-v2",
-        help="Model identifier to use (default: mlx-community/parakeet-tdt-0.6b-v2)"
+        default=None,
+        help="Model identifier to use (default: mlx-community/parakeet-tdt-0.6b-v2, or the daemon's model)"
     )
     parser.add_argument(
         "--chunk-duration",
@@ -242,15 +1153,92 @@ def main():
         default=300,
         help="Duration of each chunk in seconds for long files (default: 300 = 5 minutes)"
     )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=3.0,
+        help="Seconds each chunk overlaps the previous one, so words at chunk boundaries aren't lost (default: 3.0)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Number of chunks to transcribe per model call (default: auto, based on available memory)"
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=list(MODEL_DTYPES),
+        default=None,
+        help="Model weight precision; int8/int4 quantize the model for lower memory use (default: bf16, or the daemon's precision)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Don't cache decoded audio in {CACHE_DIR} for faster re-runs"
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Spread chunks across this many GPUs, one worker process each (multi-GPU hosts only; default: 1)"
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Split long files into fixed windows instead of on silence"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=f"Keep the model loaded and serve transcription requests on {SOCKET_PATH}"
+    )
     
     args = parser.parse_args()
     
+    if args.daemon:
+        run_daemon(args.model or "mlx-community/parakeet-tdt-0.6b-v2", args.dtype or "bf16")
+        return
+    
+    if args.audio_file is None:
+        parser.error("the following arguments are required: audio_file")
+    
+    if args.batch_size is not None and args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    
+    if args.overlap < 0 or args.overlap >= args.chunk_duration:
+        parser.error("--overlap must be at least 0 and less than --chunk-duration")
+    
+    # Use a running daemon if there is one, so the model doesn't have to be reloaded
+    job = {
+        "audio_path": str(Path(args.audio_file).resolve()),
+        "output_path": str(Path(args.output).resolve()) if args.output else None,
+        "chunk_duration": args.chunk_duration,
+        "batch_size": args.batch_size,
+        "use_vad": not args.no_vad,
+        "parallel": args.parallel,
+        "overlap": args.overlap,
+        "use_cache": not args.no_cache,
+    }
+    # Only override the daemon's resident model when asked to explicitly
+    if args.model is not None:
+        job["model"] = args.model
+    if args.dtype is not None:
+        job["dtype"] = args.dtype
+    if transcribe_via_daemon(job):
+        return
+    
     # Run transcription
     transcribe_audio(
         args.audio_file,
         args.output,
-        args.model,
-        args.chunk_duration
+        args.model or "mlx-community/parakeet-tdt-0.6b-v2",
+        args.chunk_duration,
+        batch_size=args.batch_size,
+        use_vad=not args.no_vad,
+        dtype=args.dtype or "bf16",
+        parallel=args.parallel,
+        overlap=args.overlap,
+        use_cache=not args.no_cache,
     )
 
 